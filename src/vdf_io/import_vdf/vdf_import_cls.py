@@ -19,7 +19,9 @@ from vdf_io.util import (
     extract_data_hash,
     get_final_data_path,
     get_parquet_files,
+    iter_parquet_batches,
     read_parquet_progress,
+    resolve_parquet_path,
 )
 
 
@@ -41,8 +43,6 @@ class ImportVDB(abc.ABC):
             self.args["dir"] = expand_shorthand_path(self.args["dir"])
             if not os.path.isdir(self.args["dir"]):
                 raise Exception("Invalid dir path")
-            if not os.path.isfile(os.path.join(self.args["dir"], "VDF_META.json")):
-                raise Exception("Invalid dir path, VDF_META.json not found")
             # Check if the VDF_META.json file exists
             vdf_meta_path = os.path.join(self.args["dir"], "VDF_META.json")
             if not os.path.isfile(vdf_meta_path):
@@ -52,8 +52,44 @@ class ImportVDB(abc.ABC):
         else:
             hf_dataset = self.args.get("hf_dataset", None)
             index_name = hf_dataset.split("/")[-1]
-            from huggingface_hub import HfFileSystem
+            # memoize the hub fetch locally, keyed by the dataset revision:
+            # the cache is only used while the dataset's commit sha matches,
+            # so updated metadata (dimensions, vector_columns, data_path)
+            # is refetched instead of silently pairing with fresh shards
+            cached_meta_path = os.path.join(
+                os.path.expanduser("~/.cache/vdf_io"), hf_dataset, "VDF_META.json"
+            )
+            cached = None
+            if os.path.isfile(cached_meta_path):
+                try:
+                    with open(cached_meta_path) as f:
+                        cached = json.load(f)
+                except (OSError, ValueError):
+                    cached = None
+            from huggingface_hub import HfApi, HfFileSystem
 
+            current_revision = None
+            try:
+                current_revision = HfApi().dataset_info(hf_dataset).sha
+            except Exception as e:
+                if cached is not None:
+                    print(
+                        f"Could not check {hf_dataset} revision on the Hub"
+                        f" ({e}); using cached VDF_META.json"
+                    )
+            if (
+                cached is not None
+                and "vdf_meta" in cached
+                and (
+                    current_revision is None
+                    or cached.get("revision") == current_revision
+                )
+            ):
+                print(f"Using cached VDF_META.json from {cached_meta_path}")
+                self.vdf_meta = cached["vdf_meta"]
+                print(json.dumps(self.vdf_meta, indent=4))
+                self._finish_init()
+                return
             fs = HfFileSystem()
             with Halo(text="Checking for VDF_META.json", spinner="dots"):
                 hf_files = fs.ls(f"datasets/{hf_dataset}", detail=False)
@@ -62,6 +98,11 @@ class ImportVDB(abc.ABC):
                 self.vdf_meta = json.loads(
                     fs.read_text(f"datasets/{hf_dataset}/VDF_META.json")
                 )
+                os.makedirs(os.path.dirname(cached_meta_path), exist_ok=True)
+                with open(cached_meta_path, "w") as f:
+                    json.dump(
+                        {"revision": current_revision, "vdf_meta": self.vdf_meta}, f
+                    )
             else:
                 self.vdf_meta = VDFMeta(
                     version=vdf_io.__version__,
@@ -89,6 +130,10 @@ class ImportVDB(abc.ABC):
                     },
                 ).model_dump()
             print(json.dumps(self.vdf_meta, indent=4))
+        self._finish_init()
+
+    def _finish_init(self):
+        """Validate the loaded VDF metadata, wherever it came from."""
         self.id_column = self.vdf_meta.get("id_column", ID_COLUMN) or ID_COLUMN
         if "indexes" not in self.vdf_meta:
             raise Exception("Invalid VDF_META.json, 'indexes' key not found")
@@ -166,26 +211,52 @@ class ImportVDB(abc.ABC):
         final_data_path = self.get_final_data_path(namespace_meta["data_path"])
         parquet_files = self.get_parquet_files(final_data_path)
         _, vector_column_name = self.get_vector_column_name(index_name, namespace_meta)
-        dims = -1
-        found = False
-        for file in tqdm(parquet_files, desc="Iterating parquet files"):
-            file_path = self.get_file_path(final_data_path, file)
-            df = self.read_parquet_progress(file_path, columns=[vector_column_name])
-            i = 0
-            while i < len(df[vector_column_name]):
-                first_el = df[vector_column_name].iloc[i]
-                tqdm.write(f"First element: {first_el}")
-                if first_el is None:
-                    i += 1
-                    continue
-                dims = len(self.extract_vector(first_el))
-                tqdm.write(f"Dimensions: {dims}")
-                found = True
-                break
-            if found:
-                break
+        # the common case is a well-formed vector in the first shard; probe
+        # it without spinning up the tqdm loop, then fall back to the rest
+        for file in parquet_files[:1]:
+            dims = self._probe_dims_in_file(final_data_path, file, vector_column_name)
+            if dims != -1:
+                return dims
+        for file in tqdm(parquet_files[1:], desc="Iterating parquet files"):
+            dims = self._probe_dims_in_file(final_data_path, file, vector_column_name)
+            if dims != -1:
+                return dims
+        return -1
+
+    def _probe_dims_in_file(self, final_data_path, file, vector_column_name):
+        file_path = self.get_file_path(final_data_path, file)
+        try:
+            first_el = self._peek_first_vector(file_path, vector_column_name)
+        except Exception as e:
+            tqdm.write(f"Could not read '{file_path}' while probing dims: {e}")
+            return -1
+        if first_el is None:
+            return -1
+        dims = len(self.extract_vector(first_el))
+        tqdm.write(f"Dimensions: {dims}")
         return dims
 
+    def _peek_first_vector(self, file_path, vector_column_name):
+        """
+        Return the first non-null value of the vector column, reading single
+        rows instead of materializing the whole file; only the row groups
+        actually touched are read, with no progress instrumentation.
+        """
+        from pyarrow import parquet as pq
+
+        pf = pq.ParquetFile(resolve_parquet_path(file_path))
+        if vector_column_name not in pf.schema_arrow.names:
+            tqdm.write(
+                f"Column '{vector_column_name}' not found in parquet file"
+                f" '{file_path}'. Skipping."
+            )
+            return None
+        for batch in pf.iter_batches(batch_size=1, columns=[vector_column_name]):
+            first_el = batch.column(0)[0].as_py() if len(batch) > 0 else None
+            if first_el is not None:
+                return first_el
+        return None
+
     def extract_vector(self, v):
         ret_v = None
         if isinstance(v, list) and len(v) > 1:
@@ -211,6 +282,41 @@ class ImportVDB(abc.ABC):
             ret_v = [float(x) for x in ret_v]
         return ret_v
 
+    def extract_embedding_column(self, table, vector_column_name):
+        """
+        Extract the embedding column of a pyarrow Table or RecordBatch as a
+        sequence of float32 numpy rows, flattening the list array in one shot
+        instead of materializing per-cell Python objects. Rows are views into
+        one contiguous matrix, so no Python floats are boxed along the way.
+        Null cells come back as None; callers decide whether to skip or fail.
+        """
+        import pyarrow as pa
+
+        col = table.column(vector_column_name)
+        # Table columns are ChunkedArrays; RecordBatch columns are plain
+        # Arrays and have no combine_chunks()
+        if isinstance(col, pa.ChunkedArray):
+            col = col.combine_chunks()
+        # flatten() drops null entries, so with nulls present the reshape
+        # would misalign every vector after the first null (or silently
+        # succeed with the wrong width); only the null-free path is safe
+        if col.null_count == 0:
+            try:
+                flat = col.flatten().to_numpy(zero_copy_only=False)
+                return np.ascontiguousarray(flat, dtype=np.float32).reshape(
+                    len(col), -1
+                )
+            except (ValueError, TypeError):
+                pass
+        # ragged, null-bearing, or string/bytes-encoded vectors; fall back
+        # to per-element parsing, still narrowed to float32
+        return [
+            np.asarray(self.extract_vector(v), dtype=np.float32)
+            if v is not None
+            else None
+            for v in col.to_pylist()
+        ]
+
     def update_metadata(self, metadata, vector_column_names, df):
         metadata.update(
             {
@@ -234,6 +340,9 @@ class ImportVDB(abc.ABC):
     def read_parquet_progress(self, file_path, **kwargs):
         return read_parquet_progress(file_path, self.id_column, **kwargs)
 
+    def iter_parquet_batches(self, file_path, batch_size, columns=None):
+        return iter_parquet_batches(file_path, batch_size, columns=columns)
+
     def create_new_name(self, index_name, indexes, delimiter="-"):
         if not self.args.get("create_new", False):
             return index_name
@@ -420,22 +420,39 @@ def get_qdrant_id_from_id(idx):
         return str(UUID(idx))
 
 
-def read_parquet_progress(file_path, id_column, **kwargs):
+def resolve_parquet_path(file_path):
+    """Resolve a (possibly hf://) parquet path to a local file path."""
     if file_path.startswith("hf://"):
         from huggingface_hub import HfFileSystem
         from huggingface_hub import hf_hub_download
 
         fs = HfFileSystem()
         resolved_path = fs.resolve_path(file_path)
-        cache_path = hf_hub_download(
+        return hf_hub_download(
             repo_id=resolved_path.repo_id,
             filename=resolved_path.path_in_repo,
             repo_type=resolved_path.repo_type,
         )
-        file_path_to_be_read = cache_path
-    else:
-        file_path = os.path.abspath(file_path)
-        file_path_to_be_read = file_path
+    return os.path.abspath(file_path)
+
+
+def iter_parquet_batches(file_path, batch_size, columns=None):
+    """
+    Stream a parquet file as pyarrow RecordBatches of batch_size rows, so
+    peak memory is bounded by one batch instead of the whole file.
+    """
+    from pyarrow import parquet as pq
+
+    file_path = resolve_parquet_path(file_path)
+    # pre_buffer coalesces the column-chunk reads of a row group into one
+    # request, which matters on high-latency storage (HF cache on network
+    # filesystems, FUSE mounts); on local SSDs it is a no-op
+    pf = pq.ParquetFile(file_path, pre_buffer=True)
+    yield from pf.iter_batches(batch_size=batch_size, columns=columns)
+
+
+def read_parquet_progress(file_path, id_column, **kwargs):
+    file_path_to_be_read = resolve_parquet_path(file_path)
     # read schema of the parquet file to check if columns are present
     from pyarrow import parquet as pq
 